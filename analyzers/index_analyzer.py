@@ -6,9 +6,9 @@ following MySQL 8.0+ best practices and latest naming conventions.
 """
 
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-from .utils import get_all_tables, get_table_indexes
+from .utils import load_schema_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -161,24 +161,29 @@ def analyze_index_performance(
     
     return issues
 
-def analyze_indexes(cursor, db_name: str) -> Dict[str, List[Dict[str, Any]]]:
+def analyze_indexes(
+    cursor, db_name: str, snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Comprehensive index analysis with latest MySQL 8.0+ standards.
+
+    Pass a snapshot from utils.load_schema_snapshot to reuse already fetched metadata.
     """
-    logger.info(f"Starting comprehensive index analysis for database: {db_name}")
+    logger.debug(f"Starting comprehensive index analysis for database: {db_name}")
+    
+    if snapshot is None:
+        snapshot = load_schema_snapshot(cursor, db_name)
     
     report = {}
-    tables = get_all_tables(cursor, db_name)
+    tables = snapshot['tables']
     
     for table in tables:
-        try:
-            cursor.execute(f"SELECT COUNT(*) FROM `{db_name}`.`{table}`")
-            table_rows = cursor.fetchone()[0]
-        except Exception:
-            table_rows = 0
+        # The row estimate is enough for the selectivity check (cardinality is itself
+        # an estimate) and avoids a full COUNT(*) scan of every table
+        table_rows = snapshot['table_status'].get(table, {}).get('table_rows', 0)
             
         table_issues = []
-        indexes = get_table_indexes(cursor, db_name, table)
+        indexes = snapshot['indexes'].get(table, {})
         
         # Run all analyses for the table
         table_issues.extend(analyze_index_naming_conventions(table, indexes))
@@ -201,15 +206,17 @@ def analyze_indexes(cursor, db_name: str) -> Dict[str, List[Dict[str, Any]]]:
             
             report[table] = unique_issues
     
-    logger.info(f"Index analysis completed. Analyzed {len(tables)} tables.")
+    logger.debug(f"Index analysis completed. Analyzed {len(tables)} tables.")
     return report
 
-def run_index_analysis(cursor, db_name: str) -> Dict[str, Any]:
+def run_index_analysis(
+    cursor, db_name: str, snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Main entry point for index analysis.
     """
     try:
-        return analyze_indexes(cursor, db_name)
+        return analyze_indexes(cursor, db_name, snapshot)
     except Exception as e:
         logger.error(f"Error during index analysis: {e}")
         raise
@@ -10,14 +10,19 @@ Column naming: snake_case
 
 import logging
 import collections
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 import re
 
-from .utils import get_all_tables, get_table_columns, get_table_indexes
+from .utils import get_table_columns, load_schema_snapshot, quote_sql_string
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Report markers for issue severities, shared with the server's report formatting
+SEVERITY_EMOJI = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}
+DEFAULT_SEVERITY_EMOJI = "ℹ️"
+
 # Updated naming conventions
 NAMING_CONVENTIONS = {
     'table': {
@@ -255,19 +260,25 @@ def check_index_naming(table_name: str, indexes: Dict[str, Any]) -> List[Dict[st
     
     return issues
 
-def analyze_naming_conventions(cursor, db_name: str) -> Dict[str, List[Dict[str, Any]]]:
+def analyze_naming_conventions(
+    cursor, db_name: str, snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Comprehensive analysis of database naming conventions.
     
     Args:
         cursor: MySQL database cursor
         db_name: Name of the database to analyze
+        snapshot: Optional metadata from utils.load_schema_snapshot
         
     Returns:
         dict: Analysis report with naming issues grouped by table
     """
+    if snapshot is None:
+        snapshot = load_schema_snapshot(cursor, db_name)
+    
     report = {}
-    tables = get_all_tables(cursor, db_name)
+    tables = snapshot['tables']
     
     for table in tables:
         table_issues = []
@@ -278,12 +289,12 @@ def analyze_naming_conventions(cursor, db_name: str) -> Dict[str, List[Dict[str,
             table_issues.append(table_issue)
         
         # Check column names (snake_case)
-        columns = get_table_columns(cursor, db_name, table)
+        columns = snapshot['columns'].get(table, [])
         column_issues = check_column_naming(table, columns)
         table_issues.extend(column_issues)
         
         # Check index names (snake_case with prefixes)
-        indexes = get_table_indexes(cursor, db_name, table)
+        indexes = snapshot['indexes'].get(table, {})
         index_issues = check_index_naming(table, indexes)
         table_issues.extend(index_issues)
         
@@ -292,27 +303,27 @@ def analyze_naming_conventions(cursor, db_name: str) -> Dict[str, List[Dict[str,
     
     return report
 
-def generate_naming_fix_sql(
-    cursor, issues: Dict[str, List[Dict[str, Any]]], db_name: str
-) -> List[str]:
+def generate_naming_fix_sql(cursor, issues: Dict[str, List[Dict[str, Any]]], db_name: str) -> List[str]:
     """
     Generate SQL statements to fix naming convention issues.
     This version fetches column definitions to create complete ALTER statements.
     """
     sql_statements = [
         f"-- Naming Convention Fixes for Database: {db_name}",
-        f"-- Generated on: {__import__('datetime').datetime.now()}",
+        f"-- Generated on: {datetime.now()}",
         "-- Conventions: Tables=CamelCase, Columns=snake_case",
         "-- ⚠️ IMPORTANT: Review and test these changes before applying!",
         f"\nUSE `{db_name}`;\n",
     ]
 
-    # Fetch all column definitions once to avoid repeated queries
+    # Fetch column definitions once per table with column renames. They are read fresh
+    # rather than from a cached snapshot: CHANGE COLUMN restates the whole definition,
+    # so a stale default or comment would silently revert the user's DDL.
     all_columns = {}
-    for table in issues.keys():
-        all_columns[table] = {
-            col["name"]: col for col in get_table_columns(cursor, db_name, table)
-        }
+    for table, table_issues in issues.items():
+        if any(issue["type"] == "RENAME_COLUMN" for issue in table_issues):
+            table_columns = get_table_columns(cursor, db_name, table)
+            all_columns[table] = {col["name"]: col for col in table_columns}
 
     # Group fixes by type
     fix_groups = collections.defaultdict(list)
@@ -351,20 +362,21 @@ def generate_naming_fix_sql(
                 )
                 continue
 
-            # Reconstruct the column definition string
-            definition = f"{col_def['data_type']}"
+            # Reconstruct the column definition string; COLUMN_TYPE keeps the length and
+            # UNSIGNED that DATA_TYPE drops
+            definition = f"{col_def['column_type'] or col_def['data_type']}"
             if col_def["is_nullable"] == "NO":
                 definition += " NOT NULL"
             if col_def["default"] is not None:
                 default_value = col_def["default"]
                 if isinstance(default_value, str):
-                    definition += f" DEFAULT '{default_value}'"
+                    definition += f" DEFAULT {quote_sql_string(default_value)}"
                 else:
                     definition += f" DEFAULT {default_value}"
             if col_def["extra"]:
                 definition += f" {col_def['extra']}"
             if col_def["comment"]:
-                definition += f" COMMENT '{col_def['comment']}'"
+                definition += f" COMMENT {quote_sql_string(col_def['comment'])}"
 
             sql_statements.append(
                 f"-- {issue['description']}\n"
@@ -373,22 +385,28 @@ def generate_naming_fix_sql(
             
     return sql_statements
 
-def run_naming_analysis(cursor, db_name: str) -> Dict[str, Any]:
+def run_naming_analysis(
+    cursor, db_name: str, snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Main entry point for naming convention analysis.
     
     Args:
         cursor: MySQL database cursor
         db_name: Name of the database to analyze
+        snapshot: Optional metadata from utils.load_schema_snapshot
         
     Returns:
         dict: Comprehensive naming analysis report
     """
     try:
-        logger.info(f"Starting naming convention analysis for database: {db_name}")
+        logger.debug(f"Starting naming convention analysis for database: {db_name}")
+        
+        if snapshot is None:
+            snapshot = load_schema_snapshot(cursor, db_name)
         
         # Run the analysis
-        issues = analyze_naming_conventions(cursor, db_name)
+        issues = analyze_naming_conventions(cursor, db_name, snapshot)
         
         # Count issues by severity
         critical_count = 0
@@ -407,7 +425,7 @@ def run_naming_analysis(cursor, db_name: str) -> Dict[str, Any]:
         
         # Create summary
         summary = {
-            'total_tables_analyzed': len(get_all_tables(cursor, db_name)),
+            'total_tables_analyzed': len(snapshot['tables']),
             'tables_with_issues': len(issues),
             'total_issues': critical_count + medium_count + low_count,
             'critical_issues': critical_count,
@@ -415,7 +433,7 @@ def run_naming_analysis(cursor, db_name: str) -> Dict[str, Any]:
             'low_issues': low_count
         }
         
-        logger.info(f"Naming analysis completed. Found {summary['total_issues']} issues across {summary['tables_with_issues']} tables")
+        logger.debug(f"Naming analysis completed. Found {summary['total_issues']} issues across {summary['tables_with_issues']} tables")
         
         return {
             'summary': summary,
@@ -468,7 +486,7 @@ def format_naming_report(analysis_result: Dict[str, Any]) -> str:
         report.append(f"### Table: `{table}`")
         
         for issue in table_issues:
-            severity_emoji = {"critical": "🔴", "medium": "🟡", "low": "🟢"}.get(issue['severity'], "ℹ️")
+            severity_emoji = SEVERITY_EMOJI.get(issue['severity'], DEFAULT_SEVERITY_EMOJI)
             report.append(f"{severity_emoji} **{issue['severity'].upper()}**: {issue['description']}")
             
             if issue['type'] in ['RENAME_TABLE', 'RENAME_COLUMN', 'RENAME_INDEX']:
@@ -8,12 +8,7 @@ including engine, charset, constraints, and modern schema patterns.
 import logging
 from typing import Dict, List, Any, Optional
 
-from .utils import (
-    get_table_status,
-    get_table_indexes,
-    get_foreign_key_constraints,
-    get_table_columns,
-)
+from .utils import load_schema_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +123,9 @@ def analyze_auto_increment_overflow(table_name: str, table_info: Dict[str, Any],
                 'column': column_name,
                 'current_type': data_type,
                 'recommended_type': new_type,
+                # MODIFY COLUMN restates the whole definition; carry what must survive it
+                'unsigned': 'unsigned' in (ai_column.get('column_type') or '').lower(),
+                'comment': ai_column.get('comment') or '',
                 'current_value': auto_increment,
                 'max_value': max_value,
                 'percentage_used': percentage
@@ -198,20 +196,27 @@ def analyze_table_size_and_performance(table_name: str, table_info: Dict[str, An
     
     return issues
 
-def analyze_schema(cursor, db_name: str) -> Dict[str, List[Dict[str, Any]]]:
+def analyze_schema(
+    cursor, db_name: str, snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Comprehensive schema analysis for MySQL 8.0+ best practices.
+
+    Pass a snapshot from utils.load_schema_snapshot to reuse already fetched metadata.
     """
-    logger.info(f"Starting comprehensive schema analysis for database: {db_name}")
+    logger.debug(f"Starting comprehensive schema analysis for database: {db_name}")
+    
+    if snapshot is None:
+        snapshot = load_schema_snapshot(cursor, db_name)
     
     report = {}
-    tables_info = get_table_status(cursor, db_name)
-    foreign_keys_info = get_foreign_key_constraints(cursor, db_name)
+    tables_info = snapshot['table_status']
+    foreign_keys_info = snapshot['foreign_keys']
     
     for table_name, table_info in tables_info.items():
         table_issues = []
-        columns = get_table_columns(cursor, db_name, table_name)
-        indexes = get_table_indexes(cursor, db_name, table_name)
+        columns = snapshot['columns'].get(table_name, [])
+        indexes = snapshot['indexes'].get(table_name, {})
 
         # Run all analyses for the table
         table_issues.extend(
@@ -234,5 +239,5 @@ def analyze_schema(cursor, db_name: str) -> Dict[str, List[Dict[str, Any]]]:
         if table_issues:
             report[table_name] = table_issues
             
-    logger.info(f"Schema analysis completed. Analyzed {len(tables_info)} tables.")
+    logger.debug(f"Schema analysis completed. Analyzed {len(tables_info)} tables.")
     return report
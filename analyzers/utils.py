@@ -8,6 +8,63 @@ including fetching table metadata, column details, and index information.
 import collections
 from typing import Dict, List, Any
 
+# Rows pulled from the server per round trip when streaming large result sets
+FETCH_BATCH_SIZE = 1000
+
+def iter_rows(cursor, batch_size: int = FETCH_BATCH_SIZE):
+    """Yield the rows of the last executed query, fetched in batches rather than all at once."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+def quote_sql_string(value: str) -> str:
+    """Quote a value as a MySQL string literal for generated SQL."""
+    return "'%s'" % value.replace("\\", "\\\\").replace("'", "''")
+
+def _column_from_row(row) -> Dict[str, Any]:
+    """Build a column dict from a (column_name, data_type, ..., column_comment, column_type) row."""
+    return {
+        'name': row[0],
+        'data_type': row[1],
+        'is_nullable': row[2],
+        'default': row[3],
+        'extra': row[4],
+        'key': row[5],
+        'comment': row[6],
+        # Full type including length and attributes, e.g. 'int unsigned'
+        'column_type': row[7]
+    }
+
+def _new_index_entry() -> Dict[str, Any]:
+    return {
+        'columns': [], 
+        'unique': True, 
+        'is_primary': False,
+        'type': 'BTREE',
+        'comment': '',
+        'cardinality': []
+    }
+
+def _add_index_row(indexes: Dict[str, Any], row) -> None:
+    """Merge one INFORMATION_SCHEMA.STATISTICS row into an index mapping."""
+    index_name, column_name, non_unique, seq_in_index, index_type, comment, cardinality = row
+    index = indexes[index_name]
+    
+    # Store columns in correct order
+    while len(index['columns']) < seq_in_index:
+        index['columns'].append(None)
+        index['cardinality'].append(None)
+        
+    index['columns'][seq_in_index - 1] = column_name
+    index['cardinality'][seq_in_index - 1] = cardinality or 0
+
+    index['unique'] = (non_unique == 0)
+    index['is_primary'] = (index_name == 'PRIMARY')
+    index['type'] = index_type or 'BTREE'
+    index['comment'] = comment or ''
+
 def get_all_tables(cursor, db_name: str) -> List[str]:
     """Fetch all tables from the database."""
     cursor.execute("""
@@ -28,24 +85,14 @@ def get_table_columns(cursor, db_name: str, table_name: str) -> List[Dict[str, A
             column_default,
             extra,
             column_key,
-            column_comment
+            column_comment,
+            column_type
         FROM information_schema.columns
         WHERE table_schema = %s AND table_name = %s
         ORDER BY ordinal_position
     """, (db_name, table_name))
     
-    columns = []
-    for row in cursor.fetchall():
-        columns.append({
-            'name': row[0],
-            'data_type': row[1],
-            'is_nullable': row[2],
-            'default': row[3],
-            'extra': row[4],
-            'key': row[5],
-            'comment': row[6]
-        })
-    return columns
+    return [_column_from_row(row) for row in cursor.fetchall()]
 
 def get_table_indexes(cursor, db_name: str, table_name: str) -> Dict[str, Any]:
     """Fetch all indexes for a given table, including column order and uniqueness."""
@@ -64,31 +111,9 @@ def get_table_indexes(cursor, db_name: str, table_name: str) -> Dict[str, Any]:
     """
     cursor.execute(query, (db_name, table_name))
     
-    indexes = collections.defaultdict(lambda: {
-        'columns': [], 
-        'unique': True, 
-        'is_primary': False,
-        'type': 'BTREE',
-        'comment': '',
-        'cardinality': []
-    })
-    
-    rows = cursor.fetchall()
-    for row in rows:
-        index_name, column_name, non_unique, seq_in_index, index_type, comment, cardinality = row
-        
-        # Store columns in correct order
-        while len(indexes[index_name]['columns']) < seq_in_index:
-            indexes[index_name]['columns'].append(None)
-            indexes[index_name]['cardinality'].append(None)
-            
-        indexes[index_name]['columns'][seq_in_index - 1] = column_name
-        indexes[index_name]['cardinality'][seq_in_index - 1] = cardinality or 0
-
-        indexes[index_name]['unique'] = (non_unique == 0)
-        indexes[index_name]['is_primary'] = (index_name == 'PRIMARY')
-        indexes[index_name]['type'] = index_type or 'BTREE'
-        indexes[index_name]['comment'] = comment or ''
+    indexes = collections.defaultdict(_new_index_entry)
+    for row in cursor.fetchall():
+        _add_index_row(indexes, row)
 
     return dict(indexes)
 
@@ -104,14 +129,16 @@ def get_table_status(cursor, db_name: str) -> Dict[str, Dict[str, Any]]:
             CREATE_OPTIONS,
             TABLE_COMMENT,
             DATA_LENGTH,
-            INDEX_LENGTH
+            INDEX_LENGTH,
+            TABLE_ROWS
         FROM information_schema.TABLES 
         WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
     """
     cursor.execute(query, (db_name,))
     
     tables_info = {}
-    for row in cursor.fetchall():
+    for row in iter_rows(cursor):
         table_name = row[0]
         tables_info[table_name] = {
             'engine': row[1],
@@ -121,7 +148,9 @@ def get_table_status(cursor, db_name: str) -> Dict[str, Dict[str, Any]]:
             'create_options': row[5] or '',
             'comment': row[6] or '',
             'data_length': row[7] or 0,
-            'index_length': row[8] or 0
+            'index_length': row[8] or 0,
+            # Storage-engine estimate; exact for MyISAM, approximate for InnoDB
+            'table_rows': row[9] or 0
         }
     
     return tables_info
@@ -148,7 +177,7 @@ def get_foreign_key_constraints(cursor, db_name: str) -> Dict[str, List[Dict[str
     cursor.execute(query, (db_name,))
     
     foreign_keys = collections.defaultdict(list)
-    for row in cursor.fetchall():
+    for row in iter_rows(cursor):
         table_name, constraint_name, column_name, ref_table, ref_column, update_rule, delete_rule = row
         foreign_keys[table_name].append({
             'constraint_name': constraint_name,
@@ -160,3 +189,97 @@ def get_foreign_key_constraints(cursor, db_name: str) -> Dict[str, List[Dict[str
         })
     
     return dict(foreign_keys)
+
+def get_all_table_columns(cursor, db_name: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch the columns of every table in the database with a single query."""
+    cursor.execute("""
+        SELECT 
+            table_name,
+            column_name,
+            data_type,
+            is_nullable,
+            column_default,
+            extra,
+            column_key,
+            column_comment,
+            column_type
+        FROM information_schema.columns
+        WHERE table_schema = %s
+        ORDER BY table_name, ordinal_position
+    """, (db_name,))
+    
+    columns = collections.defaultdict(list)
+    for row in iter_rows(cursor):
+        columns[row[0]].append(_column_from_row(row[1:]))
+    return dict(columns)
+
+def get_all_table_indexes(cursor, db_name: str) -> Dict[str, Dict[str, Any]]:
+    """Fetch the indexes of every table in the database with a single query."""
+    cursor.execute("""
+        SELECT 
+            TABLE_NAME,
+            INDEX_NAME, 
+            COLUMN_NAME, 
+            NON_UNIQUE,
+            SEQ_IN_INDEX,
+            INDEX_TYPE,
+            INDEX_COMMENT,
+            CARDINALITY
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    """, (db_name,))
+    
+    indexes = collections.defaultdict(lambda: collections.defaultdict(_new_index_entry))
+    for row in iter_rows(cursor):
+        _add_index_row(indexes[row[0]], row[1:])
+    return {table: dict(table_indexes) for table, table_indexes in indexes.items()}
+
+def load_schema_snapshot(cursor, db_name: str) -> Dict[str, Any]:
+    """
+    Fetch all metadata the analyzers need in one round of set-based queries.
+
+    Analyzers given a snapshot look tables, columns, indexes and foreign keys
+    up here instead of issuing per-table INFORMATION_SCHEMA queries.
+    """
+    table_status = get_table_status(cursor, db_name)
+    return {
+        'tables': list(table_status),
+        'table_status': table_status,
+        'columns': get_all_table_columns(cursor, db_name),
+        'indexes': get_all_table_indexes(cursor, db_name),
+        'foreign_keys': get_foreign_key_constraints(cursor, db_name),
+    }
+
+def get_schema_fingerprint(cursor, db_name: str) -> tuple:
+    """
+    Compute a signature of the schema's current definition.
+
+    The checksums cover table options and comments, column definitions (type,
+    nullability, default, charset, collation, comment) and index layout, so DDL
+    that changes what the analyzers or the generated fixes read also changes the
+    fingerprint. Row estimates, cardinality and AUTO_INCREMENT counters are only
+    tracked through the tables' UPDATE_TIME.
+    The server identity is included so equally named databases on different
+    servers never share a fingerprint.
+
+    This scans the database's TABLES, COLUMNS and STATISTICS rows on every call.
+    """
+    # QUOTE() keeps NULL distinct from the string 'NULL' and stops CONCAT_WS from
+    # silently skipping NULL defaults, which would shift the remaining fields
+    cursor.execute("""
+        SELECT
+            @@hostname,
+            @@port,
+            (SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s),
+            (SELECT SUM(CRC32(CONCAT_WS('.', TABLE_NAME, ENGINE, TABLE_COLLATION, ROW_FORMAT, TABLE_COMMENT)))
+               FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s),
+            (SELECT MAX(UPDATE_TIME) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s),
+            (SELECT SUM(CRC32(CONCAT_WS('.', TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, EXTRA,
+                                        QUOTE(COLUMN_DEFAULT), QUOTE(CHARACTER_SET_NAME),
+                                        QUOTE(COLLATION_NAME), COLUMN_COMMENT)))
+               FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s),
+            (SELECT SUM(CRC32(CONCAT_WS('.', TABLE_NAME, INDEX_NAME, COLUMN_NAME, SEQ_IN_INDEX, NON_UNIQUE)))
+               FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = %s)
+    """, (db_name,) * 5)
+    return tuple(cursor.fetchone())
@@ -93,6 +93,17 @@ class DatabaseConfig:
     def is_valid(self) -> bool:
         """檢查配置是否有效."""
         return bool(self.user and self.password and self.database)
+    
+    def get_connection_args(self) -> Dict[str, Any]:
+        """取得 mysql.connector 連接參數."""
+        return {
+            'host': self.host,
+            'port': self.port,
+            'user': self.user,
+            'password': self.password,
+            'database': self.database,
+            'charset': self.charset
+        }
 
 
 class ConfigManager:
@@ -155,14 +166,7 @@ class ConfigManager:
     
     def get_db_connection_args(self) -> Dict[str, Any]:
         """取得資料庫連接參數."""
-        return {
-            'host': self.db_config.host,
-            'port': self.db_config.port,
-            'user': self.db_config.user,
-            'password': self.db_config.password,
-            'database': self.db_config.database,
-            'charset': self.db_config.charset
-        }
+        return self.db_config.get_connection_args()
     
     def override_db_config(self, **kwargs) -> DatabaseConfig:
         """使用提供的參數覆蓋資料庫配置."""
@@ -172,7 +176,10 @@ class ConfigManager:
             'user': kwargs.get('db_user', self.db_config.user),
             'password': kwargs.get('db_password', self.db_config.password),
             'database': kwargs.get('db_database', self.db_config.database),
-            'charset': kwargs.get('db_charset', self.db_config.charset)
+            'charset': kwargs.get('db_charset', self.db_config.charset),
+            'pool_size': self.db_config.pool_size,
+            'max_overflow': self.db_config.max_overflow,
+            'pool_timeout': self.db_config.pool_timeout
         }
         return DatabaseConfig(**config_dict)
 
@@ -1,26 +1,114 @@
+import itertools
+import logging
+import threading
+
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector import pooling
 from config import get_config
 
-def get_db_connection():
-    """
-    Establishes a connection to the MySQL database using credentials from ConfigManager.
+# stdout carries the MCP stdio transport, so diagnostics must go through logging (stderr)
+logger = logging.getLogger(__name__)
+
+# Connection pools keyed by server and account, so per-call overrides of db_host or
+# db_user never share connections while databases on one server share a pool; the
+# requested database is selected on every checkout.
+_pools = {}
+# Guards _pools and _pool_locks only. A pool opens pool_size connections when created,
+# so creation happens under a per-key lock and a slow server never blocks other pools.
+_pools_lock = threading.Lock()
+_pool_locks = {}
+_pool_ids = itertools.count()
+
+
+def _get_pool(db_config):
+    """Return the connection pool for the given server and account, creating it on first use."""
+    key = (
+        db_config.host,
+        db_config.port,
+        db_config.user,
+        db_config.password,
+        db_config.charset,
+    )
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None:
+            return pool
+        key_lock = _pool_locks.setdefault(key, threading.Lock())
     
+    with key_lock:
+        with _pools_lock:
+            pool = _pools.get(key)
+        if pool is None:
+            pool = pooling.MySQLConnectionPool(
+                pool_name=f"mysql_analyzer_{next(_pool_ids)}",
+                pool_size=db_config.pool_size,
+                # Analyzers only read metadata, so skip COM_RESET_CONNECTION on checkin.
+                # Callers must therefore not leave transactions or session state behind.
+                pool_reset_session=False,
+                # Autocommit keeps a reused session from pinning an old read view.
+                autocommit=True,
+                **db_config.get_connection_args(),
+            )
+            with _pools_lock:
+                _pools[key] = pool
+    return pool
+
+
+def warm_pool(db_config=None, connection_timeout=5):
+    """
+    Create the connection pool for the given configuration ahead of the first request.
+
+    MySQLConnectionPool opens all of its connections when it is created, so the
+    TCP and auth handshakes are paid here instead of by the first tool call.
+    A single probe connection bounded by ``connection_timeout`` (seconds) is made
+    first, so an unreachable host fails fast instead of stalling on every pool
+    slot. The timeout is not passed to the pool itself, because mysql.connector
+    also applies it to reads and would cut off long metadata queries.
+    """
+    if db_config is None:
+        db_config = get_config().db_config
+    mysql.connector.connect(connection_timeout=connection_timeout, **db_config.get_connection_args()).close()
+    _get_pool(db_config)
+
+
+def get_db_connection(db_config=None):
+    """
+    Checks out a pooled connection to the MySQL database.
+
+    Calling ``close()`` on the returned connection hands it back to the pool
+    instead of tearing down the session. If every pooled connection is in use,
+    a standalone connection is opened instead.
+
+    Args:
+        db_config: DatabaseConfig to connect with; defaults to the ConfigManager settings.
+
     Returns:
-        mysql.connector.connection.MySQLConnection object or None if connection fails.
+        mysql.connector connection object or None if connection fails.
     """
-    config = get_config()
-    db_config = config.get_db_connection_args()
-    
-    if not all(db_config.values()):
-        print("Database configuration is incomplete. Please check your .env file.")
+    if db_config is None:
+        db_config = get_config().db_config
+
+    connection_args = db_config.get_connection_args()
+    if not all(connection_args.values()):
+        logger.error("Database configuration is incomplete. Please check your .env file.")
         return None
 
     try:
-        connection = mysql.connector.connect(**db_config)
-        if connection.is_connected():
-            return connection
+        # The pool already verifies liveness (and reconnects) on checkout, and a
+        # fresh connection is live by construction, so no extra ping is issued here.
+        try:
+            connection = _get_pool(db_config).get_connection()
+        except pooling.PoolError:
+            return mysql.connector.connect(autocommit=True, **connection_args)
+        
+        # Pools are shared by every database on the server; select this call's one
+        try:
+            connection.cmd_init_db(db_config.database)
+        except Error:
+            connection.close()
+            raise
+        return connection
     except Error as e:
-        print(f"Error connecting to MySQL database: {e}")
+        logger.error(f"Error connecting to MySQL database: {e}")
         return None
-    return None
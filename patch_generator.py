@@ -4,55 +4,223 @@ SQL Patch Generator for MySQL Analysis Issues
 This module generates SQL patches to fix issues identified by the various analyzers.
 """
 
+import functools
+import io
+import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional, TextIO
 
+from analyzers.utils import quote_sql_string
 
-def generate_patch_filename(db_name: str, patch_type: str = "mixed") -> str:
+# Large write buffer so streamed patches reach disk in few syscalls
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Patch directories already created by this process
+_ensured_dirs: set = set()
+
+# Statement templates: "-- <description>" followed by the SQL
+_TMPL_RENAME_INDEX = "-- %s\nALTER TABLE `%s` RENAME INDEX `%s` TO `%s`;"
+_TMPL_DROP_INDEX = "-- %s\nALTER TABLE `%s` DROP INDEX `%s`;"
+_TMPL_ALTER_ENGINE = "-- %s\nALTER TABLE `%s` ENGINE=InnoDB;"
+_TMPL_ALTER_CHARSET = "-- %s\nALTER TABLE `%s` CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
+_TMPL_CREATE_INDEX = "-- %s\nCREATE INDEX `%s` ON `%s` (%s);"
+# Only auto-increment columns are widened; MODIFY would otherwise drop these attributes,
+# and the UNSIGNED/COMMENT clauses are filled in from the issue data
+_TMPL_ALTER_COLUMN_TYPE = "-- %s\nALTER TABLE `%s` MODIFY COLUMN `%s` %s%s NOT NULL AUTO_INCREMENT%s;"
+_TMPL_OPTIMIZE_TABLE = "-- %s\nOPTIMIZE TABLE `%s`;"
+
+_BANNER = (
+    "-- ============================================\n"
+    "-- %s FIXES\n"
+    "-- ============================================\n"
+)
+
+
+def generate_patch_filename(db_name: str, patch_type: str = "mixed", timestamp: Optional[str] = None) -> str:
     """
     Generate a timestamped patch filename.
     
     Args:
         db_name: Name of the database
         patch_type: Type of patch (e.g., index, schema, comprehensive)
+        timestamp: Preformatted %Y%m%d_%H%M%S timestamp; defaults to now
         
     Returns:
         Formatted filename
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"patch_{db_name}_{patch_type}_{timestamp}.sql"
 
 
-def generate_index_patches(issues_data: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+def _ensure_dir(path: Path) -> None:
+    """Create path unless this process has already done so."""
+    key = os.fspath(path)
+    if key not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(key)
+
+
+def _open_patch_file(patch_dir: Path, filename: str, binary: bool):
+    """Open a patch file for writing, recreating patch_dir if it has gone missing."""
+    filepath = patch_dir / filename
+    if binary:
+        mode_args = {'mode': 'wb'}
+    else:
+        mode_args = {'mode': 'w', 'encoding': 'utf-8'}
+    
+    _ensure_dir(patch_dir)
+    try:
+        return open(filepath, buffering=_WRITE_BUFFER_SIZE, **mode_args)
+    except FileNotFoundError:
+        # The directory was removed after we first created it
+        _ensured_dirs.discard(os.fspath(patch_dir))
+        _ensure_dir(patch_dir)
+        return open(filepath, buffering=_WRITE_BUFFER_SIZE, **mode_args)
+
+
+def save_patch_stream(
+    write_fn: Callable[[TextIO], None],
+    filename: str,
+    workspace_dir: Optional[str] = None,
+) -> str:
     """
-    Generate SQL statements for index-related fixes.
+    Write a patch file by handing the open file to write_fn.
+    
+    The content is streamed to disk as it is produced instead of being
+    composed into one string first.
     
     Args:
-        issues_data: Dictionary of table issues from index analyzer
+        write_fn: Callback that writes the patch content to the given file
+        filename: Name of the patch file
+        workspace_dir: Directory to save the patch file
         
     Returns:
-        list: List of SQL statements
+        Path to the written patch file
     """
+    patch_dir = Path(workspace_dir) / 'patches' if workspace_dir else Path('patches')
+    
+    with _open_patch_file(patch_dir, filename, binary=False) as f:
+        write_fn(f)
+    
+    return str(patch_dir / filename)
+
+
+def save_patch_file(content: str, filename: str, workspace_dir: Optional[str] = None) -> str:
+    """
+    Save SQL patch content to a file under the patches directory.
+    
+    Args:
+        content: Full patch content
+        filename: Name of the patch file
+        workspace_dir: Directory to save the patch file
+        
+    Returns:
+        Path to the written patch file
+    """
+    patch_dir = Path(workspace_dir) / 'patches' if workspace_dir else Path('patches')
+    
+    # The content is complete, so encode it in one pass and skip the text layer
+    payload = content.encode('utf-8')
+    with _open_patch_file(patch_dir, filename, binary=True) as f:
+        f.write(payload)
+    
+    return str(patch_dir / filename)
+
+
+def _rename_index_sql(description: str, data: Dict[str, Any]) -> str:
+    return _TMPL_RENAME_INDEX % (description, data['table'], data['old_name'], data['new_name'])
+
+
+def _drop_index_sql(description: str, data: Dict[str, Any]) -> str:
+    return _TMPL_DROP_INDEX % (description, data['table'], data['index_name'])
+
+
+def _alter_engine_sql(description: str, data: Dict[str, Any]) -> str:
+    return _TMPL_ALTER_ENGINE % (description, data['table'])
+
+
+def _alter_charset_sql(description: str, data: Dict[str, Any]) -> str:
+    return _TMPL_ALTER_CHARSET % (description, data['table'])
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_create_index(table: str, columns: tuple) -> tuple:
+    """Return (index_name, column list) for a CREATE INDEX on the given columns."""
+    columns_str = ', '.join([f"`{col}`" for col in columns])
+    index_name = f"fk_{table}_{'_'.join(columns)}"
+    return index_name, columns_str
+
+
+def _create_index_sql(description: str, data: Dict[str, Any]) -> str:
+    # The schema analyzer reports a single FK 'column'; accept a 'columns' list too
+    columns = tuple(data['columns']) if 'columns' in data else (data['column'],)
+    index_name, columns_str = _build_create_index(data['table'], columns)
+    return _TMPL_CREATE_INDEX % (description, index_name, data['table'], columns_str)
+
+
+def _alter_column_type_sql(description: str, data: Dict[str, Any]) -> str:
+    # Widening an UNSIGNED id to a signed type would break FK type compatibility
+    unsigned = " UNSIGNED" if data.get('unsigned') else ""
+    comment = " COMMENT %s" % quote_sql_string(data['comment']) if data.get('comment') else ""
+    return _TMPL_ALTER_COLUMN_TYPE % (
+        description, data['table'], data['column'], data['recommended_type'], unsigned, comment
+    )
+
+
+def _optimize_table_sql(description: str, data: Dict[str, Any]) -> str:
+    return _TMPL_OPTIMIZE_TABLE % (description, data['table'])
+
+
+# Issue type -> statement builder, per analyzer; issue types without an entry have no automatic fix
+_INDEX_HANDLERS = {
+    'RENAME_INDEX': _rename_index_sql,
+    'DROP_INDEX': _drop_index_sql,
+}
+
+_SCHEMA_HANDLERS = {
+    'ALTER_ENGINE': _alter_engine_sql,
+    'ALTER_CHARSET': _alter_charset_sql,
+    'CREATE_INDEX': _create_index_sql,
+    'ALTER_COLUMN_TYPE': _alter_column_type_sql,
+}
+
+_PERFORMANCE_HANDLERS = {
+    'DROP_INDEX': _drop_index_sql,
+    'OPTIMIZE_TABLE': _optimize_table_sql,
+}
+
+
+def _generate_patches(issues_data: Dict[str, List[Dict[str, Any]]], handlers: Dict[str, Callable]) -> List[str]:
+    """Build the SQL statement for every issue that has a handler."""
     sql_statements = []
+    # Bound once rather than looked up on every issue
+    append = sql_statements.append
+    get_handler = handlers.get
     
-    for table, issues in issues_data.items():
+    for issues in issues_data.values():
         for issue in issues:
-            if issue['type'] == 'RENAME_INDEX':
-                data = issue['data']
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"ALTER TABLE `{data['table']}` RENAME INDEX `{data['old_name']}` TO `{data['new_name']}`;"
-                )
-            elif issue['type'] == 'DROP_INDEX':
-                data = issue['data']
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"ALTER TABLE `{data['table']}` DROP INDEX `{data['index_name']}`;"
-                )
+            handler = get_handler(issue['type'])
+            if handler:
+                append(handler(issue['description'], issue['data']))
     
     return sql_statements
 
 
+def generate_index_patches(issues_data: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """
+    Generate SQL statements for index-related fixes.
+    
+    Args:
+        issues_data: Dictionary of table issues from index analyzer
+        
+    Returns:
+        list: List of SQL statements
+    """
+    return _generate_patches(issues_data, _INDEX_HANDLERS)
+
+
 def generate_schema_patches(issues_data: Dict[str, List[Dict[str, Any]]]) -> List[str]:
     """
     Generate SQL statements for schema-related fixes.
@@ -63,36 +231,7 @@ def generate_schema_patches(issues_data: Dict[str, List[Dict[str, Any]]]) -> Lis
     Returns:
         List of SQL statements
     """
-    sql_statements = []
-    
-    for table, issues in issues_data.items():
-        for issue in issues:
-            data = issue['data']
-            
-            if issue['type'] == 'ALTER_ENGINE':
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"ALTER TABLE `{data['table']}` ENGINE=InnoDB;"
-                )
-            elif issue['type'] == 'ALTER_CHARSET':
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"ALTER TABLE `{data['table']}` CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
-                )
-            elif issue['type'] == 'CREATE_INDEX':
-                columns_str = ', '.join([f"`{col}`" for col in data['columns']])
-                index_name = f"fk_{data['table']}_{'_'.join(data['columns'])}"
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"CREATE INDEX `{index_name}` ON `{data['table']}` ({columns_str});"
-                )
-            elif issue['type'] == 'ALTER_COLUMN_TYPE':
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"ALTER TABLE `{data['table']}` MODIFY COLUMN `{data['column']}` {data['new_type']};"
-                )
-    
-    return sql_statements
+    return _generate_patches(issues_data, _SCHEMA_HANDLERS)
 
 
 def generate_performance_patches(issues_data: Dict[str, List[Dict[str, Any]]]) -> List[str]:
@@ -105,24 +244,27 @@ def generate_performance_patches(issues_data: Dict[str, List[Dict[str, Any]]]) -
     Returns:
         List of SQL statements
     """
-    sql_statements = []
-    
-    for table, issues in issues_data.items():
-        for issue in issues:
-            data = issue['data']
-            
-            if issue['type'] == 'DROP_INDEX':
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"ALTER TABLE `{data['table']}` DROP INDEX `{data['index_name']}`;"
-                )
-            elif issue['type'] == 'OPTIMIZE_TABLE':
-                sql_statements.append(
-                    f"-- {issue['description']}\n"
-                    f"OPTIMIZE TABLE `{data['table']}`;"
-                )
+    return _generate_patches(issues_data, _PERFORMANCE_HANDLERS)
+
+
+def _write_comprehensive_patch(
+    out: TextIO,
+    db_name: str,
+    generated_on: str,
+    patch_sections: Dict[str, List[str]],
+) -> None:
+    """Write the patch header and every non-empty section to out."""
+    out.write(f"-- MySQL Analysis Patch for database: {db_name}\n")
+    out.write(f"-- Generated on: {generated_on}\n")
+    out.write("-- WARNING: Review and test these statements before executing in production!\n")
+    out.write(f"USE `{db_name}`;\n\n")
     
-    return sql_statements
+    for section_name, statements in patch_sections.items():
+        if statements:
+            out.write(_BANNER % section_name)
+            for statement in statements:
+                out.write(statement)
+                out.write("\n")
 
 
 def generate_comprehensive_patch(
@@ -130,8 +272,9 @@ def generate_comprehensive_patch(
     schema_issues: Dict[str, List[Dict[str, Any]]],
     performance_issues: Dict[str, List[Dict[str, Any]]],
     db_name: str,
-    save_patch_function: callable,
+    save_patch_function: Optional[callable] = None,
     workspace_dir: Optional[str] = None,
+    now: Optional[datetime] = None,
 ) -> Optional[str]:
     """
     Generate a comprehensive patch file containing all fixes.
@@ -141,13 +284,21 @@ def generate_comprehensive_patch(
         schema_issues: Schema analyzer results
         performance_issues: Performance analyzer results
         db_name: Database name
-        save_patch_function: Function to save the patch file (e.g., from server module)
+        save_patch_function: Function to save the patch content (e.g., from server module);
+            when omitted, the patch is streamed straight to disk
         workspace_dir: Directory to save the patch file
+        now: Time to stamp the patch with, so files from one run share a timestamp;
+            defaults to the current time
         
     Returns:
         Path to the generated patch file, or None if no patches were generated.
     """
-    all_statements = []
+    # Clean schemas are the common case; skip all generation work for them
+    if not any(
+        any(issues for issues in issues_data.values())
+        for issues_data in (index_issues, schema_issues, performance_issues)
+    ):
+        return None
     
     # Generate and collect patches from all analyzers
     patch_sections = {
@@ -156,28 +307,35 @@ def generate_comprehensive_patch(
         "PERFORMANCE": generate_performance_patches(performance_issues),
     }
     
+    # Analyzers can flag the same fix (e.g. an index both redundant and unused);
+    # keep only the first occurrence of each statement, ignoring its comment line
+    seen = set()
     for section_name, statements in patch_sections.items():
-        if statements:
-            all_statements.append(f"-- ============================================")
-            all_statements.append(f"-- {section_name} FIXES")
-            all_statements.append(f"-- ============================================")
-            all_statements.extend(statements)
-            
-    if not all_statements:
+        deduped = []
+        for statement in statements:
+            body = statement.split("\n", 1)[-1]
+            if body not in seen:
+                seen.add(body)
+                deduped.append(statement)
+        patch_sections[section_name] = deduped
+    
+    if not any(patch_sections.values()):
         return None
 
-    # Prepare file content
-    header = [
-        f"-- MySQL Analysis Patch for database: {db_name}",
-        f"-- Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        "-- WARNING: Review and test these statements before executing in production!",
-        f"USE `{db_name}`;\n",
-    ]
-    
-    full_content = "\n".join(header + all_statements)
+    # One clock read for both the filename and the header
+    if now is None:
+        now = datetime.now()
+    generated_on = now.strftime('%Y-%m-%d %H:%M:%S')
+    filename = generate_patch_filename(db_name, "comprehensive", now.strftime("%Y%m%d_%H%M%S"))
     
-    # Generate filename and save the patch
-    filename = generate_patch_filename(db_name, "comprehensive")
-    filepath = save_patch_function(full_content, filename, workspace_dir)
+    if save_patch_function is None:
+        return save_patch_stream(
+            lambda f: _write_comprehensive_patch(f, db_name, generated_on, patch_sections),
+            filename,
+            workspace_dir,
+        )
     
-    return filepath
+    # A custom save function needs the content as one string
+    buf = io.StringIO()
+    _write_comprehensive_patch(buf, db_name, generated_on, patch_sections)
+    return save_patch_function(buf.getvalue(), filename, workspace_dir)
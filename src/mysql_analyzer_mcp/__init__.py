@@ -8,11 +8,13 @@ __version__ = "1.0.0"
 __author__ = "MySQL Analyzer Team"
 __description__ = "MySQL Database Analyzer MCP Server with CamelCase tables and snake_case columns"
 
-# Ensure the package can be imported properly
-try:
-    from . import server
-except ImportError:
-    # Handle case where the package is imported from different contexts
-    pass
-
 __all__ = ["server"]
+
+
+def __getattr__(name):
+    # Import the server lazily so reading package metadata doesn't load
+    # the MCP SDK, the MySQL driver and every analyzer
+    if name == "server":
+        import importlib
+        return importlib.import_module(f"{__name__}.server")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,10 +11,20 @@ Following the official MCP Python SDK patterns from https://modelcontextprotocol
 """
 
 import asyncio
+import functools
+import io
+import json
+import os
 import sys
 import logging
+import threading
+import time
+import traceback
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 # Add project root to Python path
@@ -38,6 +48,7 @@ try:
         performance_analyzer,
         schema_analyzer,
     )
+    from analyzers.utils import get_schema_fingerprint, load_schema_snapshot
     import patch_generator
 except ImportError as e:
     # Add a more helpful error message for debugging
@@ -49,9 +60,10 @@ except ImportError as e:
     )
     raise
 
-# Configure logging
+# Configure logging; LOG_LEVEL (e.g. DEBUG) comes from the process environment
+_log_level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), None)
 logging.basicConfig(
-    level=logging.INFO,
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler(sys.stderr)],
 )
@@ -60,7 +72,35 @@ logger = logging.getLogger("mysql-analyzer-mcp")
 # Create the server instance following MCP patterns
 server = Server("mysql-analyzer-mcp")
 
+# Analyzer results per database, least recently used first, as
+# db_name -> {analyzer: (fingerprint, stored_at, result)} so that any DDL invalidates them.
+# Performance results store a key built from performance_cache_key in its place.
+_ANALYSIS_CACHE: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+# Each entry holds a full schema snapshot, so only this many databases are kept
+_ANALYSIS_CACHE_MAX_DATABASES = 8
+# Analyzers run on several executor threads at once
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+# Performance findings depend on live server statistics rather than the schema alone,
+# so they are only reused for a short window (seconds). The standalone performance tool
+# keys them on the server alone (see performance_cache_key) to skip the fingerprint query;
+# full analyses add the schema fingerprint they already have.
+_PERFORMANCE_CACHE_TTL = 60
+
+# Blocking database work runs here rather than on the default executor, so it cannot be
+# starved by (or starve) unrelated asyncio.to_thread calls. Sized to the connections
+# a burst of tool calls may hold at once.
+_DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=get_config().db_config.pool_size + get_config().db_config.max_overflow,
+    thread_name_prefix="mysql-analyzer-db",
+)
+
 # Helper functions
+async def run_db_call(func, *args, **kwargs) -> Any:
+    """Run a blocking database call on the database executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, functools.partial(func, *args, **kwargs))
+
 async def get_database_connection(arguments: Dict[str, Any]) -> tuple:
     """
     Get database connection using provided arguments or configuration.
@@ -75,513 +115,637 @@ async def get_database_connection(arguments: Dict[str, Any]) -> tuple:
         raise ValueError("Database configuration is incomplete. Please provide credentials or set up your .env file.")
 
     try:
-        connection = db_connector.get_db_connection()
-        if not connection or not connection.is_connected():
+        # Connecting blocks on the TCP/auth handshake; keep it off the event loop
+        # so other in-flight MCP requests are not stalled behind it.
+        connection = await run_db_call(db_connector.get_db_connection, db_config)
+        if not connection:
             raise ConnectionError("Failed to establish database connection.")
         return connection, db_config.database
     except Exception as e:
         logger.error(f"Database connection error: {e}")
         raise
 
-def save_patch_file(content: str, filename: str, workspace_dir: Optional[str] = None) -> str:
-    """Save SQL patch content to file."""
-    if workspace_dir:
-        patch_dir = Path(workspace_dir) / 'patches'
-    else:
-        patch_dir = Path('patches')
+@asynccontextmanager
+async def db_cursor(arguments: Dict[str, Any]):
+    """
+    Check out a connection for the given tool arguments and yield (cursor, db_name).
+    The cursor is closed and the connection handed back to the pool on exit.
+    """
+    connection, db_name = await get_database_connection(arguments)
+    try:
+        cursor = connection.cursor()
+        try:
+            yield cursor, db_name
+        finally:
+            cursor.close()
+    finally:
+        # Returns pooled connections to the pool rather than disconnecting
+        connection.close()
+
+async def report_progress(progress: float, total: float) -> None:
+    """
+    Send an MCP progress notification for the current tool call.
+    Does nothing unless the client supplied a progressToken with the request.
+    """
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return
     
-    patch_dir.mkdir(exist_ok=True)
-    filepath = patch_dir / filename
+    progress_token = ctx.meta.progressToken if ctx.meta else None
+    if progress_token is None:
+        return
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    await ctx.session.send_progress_notification(progress_token, progress, total)
+
+def get_cached_analysis(
+    name: str, db_name: str, fingerprint: tuple, max_age: Optional[float] = None
+) -> Optional[Any]:
+    """
+    Return the cached result of an analyzer if it was computed against this fingerprint
+    and, when max_age is given, no more than max_age seconds ago.
+    """
+    with _ANALYSIS_CACHE_LOCK:
+        entries = _ANALYSIS_CACHE.get(db_name)
+        if entries is None:
+            return None
+        _ANALYSIS_CACHE.move_to_end(db_name)
+        cached = entries.get(name)
     
-    logger.info(f"Saved patch file: {filepath}")
-    return str(filepath)
+    if not cached or cached[0] != fingerprint:
+        return None
+    if max_age is not None and time.monotonic() - cached[1] > max_age:
+        return None
+    
+    logger.debug(f"Using cached {name} analysis for database: {db_name}")
+    return cached[2]
+
+def run_cached_analysis(
+    name: str, analyze, cursor, db_name: str, fingerprint: tuple,
+    max_age: Optional[float] = None, **kwargs
+) -> Any:
+    """
+    Run an analyzer, reusing its previous result while the schema fingerprint is unchanged
+    (and the result is younger than max_age, if given).
+    """
+    result = get_cached_analysis(name, db_name, fingerprint, max_age)
+    if result is not None:
+        return result
+
+    result = analyze(cursor, db_name, **kwargs)
+    with _ANALYSIS_CACHE_LOCK:
+        entries = _ANALYSIS_CACHE.setdefault(db_name, {})
+        _ANALYSIS_CACHE.move_to_end(db_name)
+        entries[name] = (fingerprint, time.monotonic(), result)
+        while len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_MAX_DATABASES:
+            _ANALYSIS_CACHE.popitem(last=False)
+    return result
+
+def performance_cache_key(arguments: Dict[str, Any]) -> tuple:
+    """
+    Stand-in for the schema fingerprint when caching performance results: identifies the
+    server and account the tool arguments connect with, so a cache hit needs no query.
+    """
+    db_config = get_config().override_db_config(**arguments)
+    return (db_config.host, db_config.port, db_config.user)
+
+def wants_json(arguments: Dict[str, Any]) -> bool:
+    """Whether the caller asked for raw JSON results instead of a markdown report."""
+    return arguments.get("response_format") == "json"
+
+def _run_timestamp(now: Optional[datetime] = None) -> str:
+    """Timestamp used in patch filenames; pass one datetime to stamp every file of a run alike."""
+    return (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
+
+def to_json(payload: Dict[str, Any]) -> str:
+    """Serialize analysis results; values JSON lacks (Decimal, datetime) become strings."""
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+def load_fingerprinted_snapshot(cursor, db_name: str) -> tuple:
+    """Fingerprint the schema and return (fingerprint, snapshot), reusing a cached snapshot."""
+    fingerprint = get_schema_fingerprint(cursor, db_name)
+    snapshot = run_cached_analysis("snapshot", load_schema_snapshot, cursor, db_name, fingerprint)
+    return fingerprint, snapshot
+
+async def run_all_analyses(
+    arguments: Dict[str, Any], cursor, db_name: str, fingerprint: tuple, snapshot: Dict[str, Any]
+) -> tuple:
+    """
+    Run the naming, index, performance and schema analyzers concurrently in worker threads.
+
+    Given a snapshot, the naming, index and schema analyzers never touch their cursor
+    and can share the caller's. The performance analyzer queries the database, so it
+    gets its own pooled connection.
+
+    Returns:
+        (naming_analysis, index_report, performance_report, schema_report)
+    """
+    completed = 0
+
+    async def tracked(coro):
+        nonlocal completed
+        result = await coro
+        completed += 1
+        await report_progress(completed, 4)
+        return result
+
+    async def on_own_connection(name: str, analyze, key: tuple, max_age: Optional[float] = None, **kwargs):
+        # A cached result needs no queries, so don't check out a connection for it
+        cached = get_cached_analysis(name, db_name, key, max_age)
+        if cached is not None:
+            return cached
+
+        async with db_cursor(arguments) as (own_cursor, _):
+            return await run_db_call(
+                run_cached_analysis, name, analyze, own_cursor, db_name, key,
+                max_age=max_age, **kwargs
+            )
+
+    return await asyncio.gather(
+        tracked(run_db_call(
+            run_cached_analysis, "naming", naming_analyzer.run_naming_analysis,
+            cursor, db_name, fingerprint, snapshot=snapshot
+        )),
+        tracked(run_db_call(
+            run_cached_analysis, "index", index_analyzer.run_index_analysis,
+            cursor, db_name, fingerprint, snapshot=snapshot
+        )),
+        # Results here feed patch generation, so a schema change (e.g. an applied
+        # DROP INDEX) must invalidate them despite the TTL
+        tracked(on_own_connection(
+            "performance", performance_analyzer.analyze_performance,
+            (performance_cache_key(arguments), fingerprint), max_age=_PERFORMANCE_CACHE_TTL
+        )),
+        tracked(run_db_call(
+            run_cached_analysis, "schema", schema_analyzer.analyze_schema,
+            cursor, db_name, fingerprint, snapshot=snapshot
+        )),
+    )
+
+async def save_patch_file(content: str, filename: str, workspace_dir: Optional[str] = None) -> str:
+    """Save SQL patch content to file without blocking the event loop."""
+    filepath = await asyncio.to_thread(patch_generator.save_patch_file, content, filename, workspace_dir)
+    logger.debug(f"Saved patch file: {filepath}")
+    return filepath
 
 # MCP Tools - following official @mcp.tool() decorator pattern
 
+# Connection overrides accepted by every tool; shared so each schema references the same dicts
+_DB_CREDENTIAL_PROPERTIES = {
+    "db_host": {"type": "string", "description": "Database host (optional, defaults to .env)"},
+    "db_user": {"type": "string", "description": "Database username (optional, defaults to .env)"},
+    "db_password": {"type": "string", "description": "Database password (optional, defaults to .env)"},
+    "db_database": {"type": "string", "description": "Database name (optional, defaults to .env)"},
+}
+
+# Lets clients that parse results programmatically skip the markdown rendering
+_RESPONSE_FORMAT_PROPERTIES = {
+    "response_format": {
+        "type": "string",
+        "enum": ["markdown", "json"],
+        "description": "Return a markdown report or the raw analysis results as JSON",
+        "default": "markdown"
+    },
+}
+
+# The tool catalog is static, so build it once at import instead of per list_tools request
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="analyze_naming_conventions",
+        description="Analyze and enforce MySQL naming conventions (CamelCase tables, snake_case columns)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                **_DB_CREDENTIAL_PROPERTIES,
+                **_RESPONSE_FORMAT_PROPERTIES,
+                "fix_issues": {
+                    "type": "boolean",
+                    "description": "Generate SQL fixes automatically",
+                    "default": True
+                },
+                "workspace_dir": {
+                    "type": "string",
+                    "description": "Directory to save SQL patch files (optional)"
+                }
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="analyze_database_indexes", 
+        description="Analyze database indexes for naming conventions and redundancy issues",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                **_DB_CREDENTIAL_PROPERTIES,
+                **_RESPONSE_FORMAT_PROPERTIES
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="analyze_database_performance",
+        description="Analyze database performance issues and bottlenecks",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                **_DB_CREDENTIAL_PROPERTIES,
+                **_RESPONSE_FORMAT_PROPERTIES
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="analyze_database_schema",
+        description="Analyze database schema compliance with MySQL best practices",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                **_DB_CREDENTIAL_PROPERTIES,
+                **_RESPONSE_FORMAT_PROPERTIES
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="comprehensive_analysis",
+        description="Run all analysis types and generate comprehensive report with SQL patches",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                **_DB_CREDENTIAL_PROPERTIES,
+                **_RESPONSE_FORMAT_PROPERTIES,
+                "generate_patches": {"type": "boolean", "description": "Generate SQL patches", "default": True},
+                "workspace_dir": {"type": "string", "description": "Directory to save files (optional)"}
+            },
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="generate_sql_patches",
+        description="Generate SQL patch files to fix identified issues",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                **_DB_CREDENTIAL_PROPERTIES,
+                "patch_type": {
+                    "type": "string",
+                    "enum": ["naming", "indexes", "performance", "schema", "comprehensive"],
+                    "description": "Type of patches to generate",
+                    "default": "comprehensive"
+                },
+                "workspace_dir": {"type": "string", "description": "Directory to save patch files (optional)"}
+            },
+            "required": []
+        }
+    )
+]
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools for the MySQL analyzer."""
-    return [
-        types.Tool(
-            name="analyze_naming_conventions",
-            description="Analyze and enforce MySQL naming conventions (CamelCase tables, snake_case columns)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_host": {
-                        "type": "string",
-                        "description": "Database host (optional, defaults to .env)"
-                    },
-                    "db_user": {
-                        "type": "string", 
-                        "description": "Database username (optional, defaults to .env)"
-                    },
-                    "db_password": {
-                        "type": "string",
-                        "description": "Database password (optional, defaults to .env)"
-                    },
-                    "db_database": {
-                        "type": "string",
-                        "description": "Database name (optional, defaults to .env)"
-                    },
-                    "fix_issues": {
-                        "type": "boolean",
-                        "description": "Generate SQL fixes automatically",
-                        "default": True
-                    },
-                    "workspace_dir": {
-                        "type": "string",
-                        "description": "Directory to save SQL patch files (optional)"
-                    }
-                },
-                "required": []
-            }
-        ),
-        types.Tool(
-            name="analyze_database_indexes", 
-            description="Analyze database indexes for naming conventions and redundancy issues",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_host": {"type": "string", "description": "Database host (optional)"},
-                    "db_user": {"type": "string", "description": "Database username (optional)"},
-                    "db_password": {"type": "string", "description": "Database password (optional)"},
-                    "db_database": {"type": "string", "description": "Database name (optional)"}
-                },
-                "required": []
-            }
-        ),
-        types.Tool(
-            name="analyze_database_performance",
-            description="Analyze database performance issues and bottlenecks",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_host": {"type": "string", "description": "Database host (optional)"},
-                    "db_user": {"type": "string", "description": "Database username (optional)"}, 
-                    "db_password": {"type": "string", "description": "Database password (optional)"},
-                    "db_database": {"type": "string", "description": "Database name (optional)"}
-                },
-                "required": []
-            }
-        ),
-        types.Tool(
-            name="analyze_database_schema",
-            description="Analyze database schema compliance with MySQL best practices",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_host": {"type": "string", "description": "Database host (optional)"},
-                    "db_user": {"type": "string", "description": "Database username (optional)"},
-                    "db_password": {"type": "string", "description": "Database password (optional)"},
-                    "db_database": {"type": "string", "description": "Database name (optional)"}
-                },
-                "required": []
-            }
-        ),
-        types.Tool(
-            name="comprehensive_analysis",
-            description="Run all analysis types and generate comprehensive report with SQL patches",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_host": {"type": "string", "description": "Database host (optional)"},
-                    "db_user": {"type": "string", "description": "Database username (optional)"},
-                    "db_password": {"type": "string", "description": "Database password (optional)"},
-                    "db_database": {"type": "string", "description": "Database name (optional)"},
-                    "generate_patches": {"type": "boolean", "description": "Generate SQL patches", "default": True},
-                    "workspace_dir": {"type": "string", "description": "Directory to save files (optional)"}
-                },
-                "required": []
-            }
-        ),
-        types.Tool(
-            name="generate_sql_patches",
-            description="Generate SQL patch files to fix identified issues",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_host": {"type": "string", "description": "Database host (optional)"},
-                    "db_user": {"type": "string", "description": "Database username (optional)"},
-                    "db_password": {"type": "string", "description": "Database password (optional)"},
-                    "db_database": {"type": "string", "description": "Database name (optional)"},
-                    "patch_type": {
-                        "type": "string",
-                        "enum": ["naming", "indexes", "performance", "schema", "comprehensive"],
-                        "description": "Type of patches to generate",
-                        "default": "comprehensive"
-                    },
-                    "workspace_dir": {"type": "string", "description": "Directory to save patch files (optional)"}
-                },
-                "required": []
-            }
-        )
-    ]
+    return _TOOLS
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls following MCP patterns."""
     
-    logger.info(f"Executing tool: {name}")
+    started = time.perf_counter()
     
     try:
-        if name == "analyze_naming_conventions":
-            result = await tool_analyze_naming_conventions(arguments)
-        elif name == "analyze_database_indexes":
-            result = await tool_analyze_database_indexes(arguments)
-        elif name == "analyze_database_performance":
-            result = await tool_analyze_database_performance(arguments)
-        elif name == "analyze_database_schema":
-            result = await tool_analyze_database_schema(arguments)
-        elif name == "comprehensive_analysis":
-            result = await tool_comprehensive_analysis(arguments)
-        elif name == "generate_sql_patches":
-            result = await tool_generate_sql_patches(arguments)
-        else:
+        handler = _TOOL_HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        result = await handler(arguments)
         
+        # One summary line per call; per-phase detail is logged at DEBUG
+        logger.info(f"Tool {name} completed in {time.perf_counter() - started:.3f}s")
         return [types.TextContent(type="text", text=result)]
         
     except Exception as e:
-        logger.error(f"Tool execution error for {name}: {e}")
-        import traceback
-        error_msg = f"❌ Error executing {name}: {str(e)}\n\nDebug info:\n{traceback.format_exc()}"
+        logger.exception(f"Tool execution error for {name} after {time.perf_counter() - started:.3f}s: {e}")
+        error_msg = f"❌ Error executing {name}: {str(e)}"
+        # logger.exception always logs the stack; the client only gets it with LOG_LEVEL=DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            error_msg += f"\n\nDebug info:\n{traceback.format_exc()}"
         return [types.TextContent(type="text", text=error_msg)]
 
+# Report formatting - analyzers compute, these helpers only render their reports
+
+# The comprehensive summary reports high-severity findings under "medium"
+_SEVERITY_BUCKET = {"critical": "critical", "high": "medium", "medium": "medium", "low": "low"}
+
+_INDEX_HEADER = "📊 **MySQL Index Analysis Report**\n" + "=" * 40 + "\n\n"
+_PERFORMANCE_HEADER = "⚡ **MySQL Performance Analysis Report**\n" + "=" * 40 + "\n\n"
+_SCHEMA_HEADER = "🏗️ **MySQL Schema Analysis Report**\n" + "=" * 40 + "\n\n"
+_COMPREHENSIVE_HEADER = "🔍 **MySQL Comprehensive Analysis Report**\n" + "=" * 50 + "\n"
+
+# Index report sections, in display order, keyed by the issue type they list
+_INDEX_ISSUE_SECTIONS = (
+    ('RENAME_INDEX', "\n**🏷️ Index Naming Issues:**\n"),
+    ('DROP_INDEX', "\n**🔄 Redundant Indexes:**\n"),
+    ('LOW_CARDINALITY_INDEX', "\n**⚡ Performance Issues:**\n"),
+)
+
+def _group_issues(issues: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Bucket issues by type in a single pass."""
+    grouped = {}
+    for issue in issues:
+        grouped.setdefault(issue['type'], []).append(issue)
+    return grouped
+
+def write_index_issues(buf: io.StringIO, index_report: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Render index analyzer findings per table, grouped by issue type."""
+    for table, issues in index_report.items():
+        buf.write(f"### Table: `{table}`\n")
+        
+        # Group issues by type for better readability
+        grouped = _group_issues(issues)
+        for issue_type, heading in _INDEX_ISSUE_SECTIONS:
+            section = grouped.get(issue_type)
+            if section:
+                buf.write(heading)
+                for issue in section:
+                    buf.write(f"- {issue['description']}\n")
+        
+        buf.write("\n")
+
+def write_issues_by_severity(buf: io.StringIO, report: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Render analyzer findings per table, prefixed with their severity."""
+    for table, issues in report.items():
+        buf.write(f"### Table: `{table}`\n")
+        
+        for issue in issues:
+            severity = issue.get('severity', 'low')
+            severity_emoji = naming_analyzer.SEVERITY_EMOJI.get(severity, naming_analyzer.DEFAULT_SEVERITY_EMOJI)
+            buf.write(f"{severity_emoji} **{severity.upper()}**: {issue.get('description')}\n")
+        
+        buf.write("\n")
+
 # Tool implementations
 
 async def tool_analyze_naming_conventions(arguments: Dict[str, Any]) -> str:
     """Analyze naming conventions tool (CamelCase tables, snake_case columns)."""
     
-    connection, db_name = await get_database_connection(arguments)
-    cursor = None
-    
-    try:
-        cursor = connection.cursor()
-        logger.info(f"Starting naming analysis for database: {db_name}")
+    async with db_cursor(arguments) as (cursor, db_name):
+        fingerprint, snapshot = await run_db_call(load_fingerprinted_snapshot, cursor, db_name)
+        logger.debug(f"Starting naming analysis for database: {db_name}")
         
         # Run naming analysis
-        analysis_result = naming_analyzer.run_naming_analysis(cursor, db_name)
-        
-        # Format the report
-        report = naming_analyzer.format_naming_report(analysis_result)
+        analysis_result = await run_db_call(
+            run_cached_analysis, "naming", naming_analyzer.run_naming_analysis, cursor, db_name, fingerprint,
+            snapshot=snapshot
+        )
         
         # Generate SQL fixes if requested
         fix_issues = arguments.get("fix_issues", True)
         workspace_dir = arguments.get("workspace_dir")
+        filepath = None
         
         if fix_issues and analysis_result.get('issues'):
-            sql_fixes = naming_analyzer.generate_naming_fix_sql(cursor, analysis_result['issues'], db_name)
+            sql_fixes = await run_db_call(
+                naming_analyzer.generate_naming_fix_sql, cursor, analysis_result['issues'], db_name
+            )
             
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = _run_timestamp()
             filename = f"naming_fixes_{db_name}_{timestamp}.sql"
             
-            filepath = save_patch_file('\n'.join(sql_fixes), filename, workspace_dir)
-            
-            report += f"\n\n## 🔧 SQL Fixes Generated\n\n"
-            report += f"✅ **Patch file created:** `{filepath}`\n\n"
-            report += f"⚠️ **Important:** Review and test all patches in a development environment before applying to production!\n"
+            filepath = await save_patch_file('\n'.join(sql_fixes), filename, workspace_dir)
         
-        logger.info(f"Naming analysis completed")
-        return report
+        logger.debug("Naming analysis completed")
         
-    finally:
-        if cursor:
-            cursor.close()
-        if connection and connection.is_connected():
-            connection.close()
+        if wants_json(arguments):
+            return to_json({"database": db_name, "analysis": analysis_result, "patch_file": filepath})
+        
+        # Format the report
+        buf = io.StringIO()
+        buf.write(naming_analyzer.format_naming_report(analysis_result))
+        
+        if filepath:
+            buf.write("\n\n## 🔧 SQL Fixes Generated\n\n")
+            buf.write(f"✅ **Patch file created:** `{filepath}`\n\n")
+            buf.write("⚠️ **Important:** Review and test all patches in a development environment before applying to production!\n")
+        
+        return buf.getvalue()
 
 async def tool_analyze_database_indexes(arguments: Dict[str, Any]) -> str:
     """Analyze database indexes."""
     
-    connection, db_name = await get_database_connection(arguments)
-    cursor = None
-    
-    try:
-        cursor = connection.cursor()
-        logger.info(f"Starting index analysis for database: {db_name}")
+    async with db_cursor(arguments) as (cursor, db_name):
+        fingerprint, snapshot = await run_db_call(load_fingerprinted_snapshot, cursor, db_name)
+        logger.debug(f"Starting index analysis for database: {db_name}")
+        
+        index_report = await run_db_call(
+            run_cached_analysis, "index", index_analyzer.run_index_analysis, cursor, db_name, fingerprint,
+            snapshot=snapshot
+        )
         
-        index_report = index_analyzer.run_index_analysis(cursor, db_name)
+        if wants_json(arguments):
+            return to_json({"database": db_name, "issues": index_report})
         
         if not index_report:
             return "✅ **Index Analysis Complete**\n\nNo index issues found! All indexes follow proper naming conventions and no redundant indexes detected."
         
-        result = ["📊 **MySQL Index Analysis Report**", "=" * 40, ""]
-        
-        for table, issues in index_report.items():
-            result.append(f"### Table: `{table}`")
-            
-            # Group issues by type for better readability
-            naming_issues = [i for i in issues if i['type'] == 'RENAME_INDEX']
-            redundancy_issues = [i for i in issues if i['type'] == 'DROP_INDEX']
-            performance_issues = [i for i in issues if i['type'] == 'LOW_CARDINALITY_INDEX']
-
-            if naming_issues:
-                result.append("\n**🏷️ Index Naming Issues:**")
-                for issue in naming_issues:
-                    result.append(f"- {issue['description']}")
-            
-            if redundancy_issues:
-                result.append("\n**🔄 Redundant Indexes:**")
-                for issue in redundancy_issues:
-                    result.append(f"- {issue['description']}")
-            
-            if performance_issues:
-                result.append("\n**⚡ Performance Issues:**")
-                for issue in performance_issues:
-                    result.append(f"- {issue['description']}")
-            
-            result.append("")
-        
-        return "\n".join(result)
+        buf = io.StringIO()
+        buf.write(_INDEX_HEADER)
+        write_index_issues(buf, index_report)
         
-    finally:
-        if cursor:
-            cursor.close()
-        if connection and connection.is_connected():
-            connection.close()
+        return buf.getvalue()
 
 async def tool_analyze_database_performance(arguments: Dict[str, Any]) -> str:
     """Analyze database performance."""
     
-    connection, db_name = await get_database_connection(arguments)
-    cursor = None
+    # Checked before connecting: a warm hit needs neither a connection nor a query
+    key = performance_cache_key(arguments)
+    db_name = get_config().override_db_config(**arguments).database
+    performance_report = get_cached_analysis("performance", db_name, key, _PERFORMANCE_CACHE_TTL)
     
-    try:
-        cursor = connection.cursor()
-        logger.info(f"Starting performance analysis for database: {db_name}")
-        
-        performance_report = performance_analyzer.analyze_performance(cursor, db_name)
-        
-        if not performance_report:
-            return "✅ **Performance Analysis Complete**\n\nNo performance issues detected! Database appears to be well-optimized."
-        
-        result = ["⚡ **MySQL Performance Analysis Report**", "=" * 40, ""]
-        
-        for table, issues in performance_report.items():
-            result.append(f"### Table: `{table}`")
-            
-            for issue in issues:
-                severity_emoji = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}.get(issue.get('severity', 'low'), "ℹ️")
-                result.append(f"{severity_emoji} **{issue.get('severity', 'low').upper()}**: {issue.get('description')}")
-            
-            result.append("")
-        
-        return "\n".join(result)
-        
-    finally:
-        if cursor:
-            cursor.close()
-        if connection and connection.is_connected():
-            connection.close()
+    if performance_report is None:
+        async with db_cursor(arguments) as (cursor, db_name):
+            logger.debug(f"Starting performance analysis for database: {db_name}")
+            performance_report = await run_db_call(
+                run_cached_analysis, "performance", performance_analyzer.analyze_performance, cursor, db_name, key,
+                max_age=_PERFORMANCE_CACHE_TTL
+            )
+    
+    if wants_json(arguments):
+        return to_json({"database": db_name, "issues": performance_report})
+    
+    if not performance_report:
+        return "✅ **Performance Analysis Complete**\n\nNo performance issues detected! Database appears to be well-optimized."
+    
+    buf = io.StringIO()
+    buf.write(_PERFORMANCE_HEADER)
+    write_issues_by_severity(buf, performance_report)
+    
+    return buf.getvalue()
 
 async def tool_analyze_database_schema(arguments: Dict[str, Any]) -> str:
     """Analyze database schema."""
     
-    connection, db_name = await get_database_connection(arguments)
-    cursor = None
-    
-    try:
-        cursor = connection.cursor()
-        logger.info(f"Starting schema analysis for database: {db_name}")
+    async with db_cursor(arguments) as (cursor, db_name):
+        fingerprint, snapshot = await run_db_call(load_fingerprinted_snapshot, cursor, db_name)
+        logger.debug(f"Starting schema analysis for database: {db_name}")
+        
+        schema_report = await run_db_call(
+            run_cached_analysis, "schema", schema_analyzer.analyze_schema, cursor, db_name, fingerprint,
+            snapshot=snapshot
+        )
         
-        schema_report = schema_analyzer.analyze_schema(cursor, db_name)
+        if wants_json(arguments):
+            return to_json({"database": db_name, "issues": schema_report})
         
         if not schema_report:
             return "✅ **Schema Analysis Complete**\n\nSchema is compliant! All tables use recommended settings."
         
-        result = ["🏗️ **MySQL Schema Analysis Report**", "=" * 40, ""]
-        
-        for table, issues in schema_report.items():
-            result.append(f"### Table: `{table}`")
-            
-            for issue in issues:
-                severity_emoji = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}.get(issue.get('severity', 'low'), "ℹ️")
-                result.append(f"{severity_emoji} **{issue.get('severity', 'low').upper()}**: {issue.get('description')}")
-            
-            result.append("")
-        
-        return "\n".join(result)
+        buf = io.StringIO()
+        buf.write(_SCHEMA_HEADER)
+        write_issues_by_severity(buf, schema_report)
         
-    finally:
-        if cursor:
-            cursor.close()
-        if connection and connection.is_connected():
-            connection.close()
+        return buf.getvalue()
 
 async def tool_comprehensive_analysis(arguments: Dict[str, Any]) -> str:
     """Run comprehensive analysis."""
     
-    connection, db_name = await get_database_connection(arguments)
-    cursor = None
-    
-    try:
-        cursor = connection.cursor()
-        logger.info(f"Starting comprehensive analysis for database: {db_name}")
+    async with db_cursor(arguments) as (cursor, db_name):
+        fingerprint, snapshot = await run_db_call(load_fingerprinted_snapshot, cursor, db_name)
+        logger.debug(f"Starting comprehensive analysis for database: {db_name}")
         
-        # Run all analyses
-        naming_analysis = naming_analyzer.run_naming_analysis(cursor, db_name)
-        index_report = index_analyzer.run_index_analysis(cursor, db_name)
-        performance_report = performance_analyzer.analyze_performance(cursor, db_name)
-        schema_report = schema_analyzer.analyze_schema(cursor, db_name)
+        # Run all analyses concurrently, reporting progress as each one finishes
+        naming_analysis, index_report, performance_report, schema_report = await run_all_analyses(
+            arguments, cursor, db_name, fingerprint, snapshot
+        )
         
         # Count issues by severity
-        critical_count = medium_count = low_count = 0
+        severity_counts = Counter(
+            _SEVERITY_BUCKET.get(issue.get('severity'))
+            for report in (naming_analysis.get('issues', {}), performance_report, schema_report)
+            for issues in report.values()
+            for issue in issues
+        )
+        critical_count = severity_counts['critical']
+        medium_count = severity_counts['medium']
+        low_count = severity_counts['low']
         
-        # Count naming issues
-        if naming_analysis.get('issues'):
-            for table, issues in naming_analysis['issues'].items():
-                for issue in issues:
-                    if issue.get('severity') == 'critical':
-                        critical_count += 1
-                    elif issue.get('severity') in ['medium', 'high']:
-                        medium_count += 1
-                    elif issue.get('severity') == 'low':
-                        low_count += 1
-        
-        # Count from other analyses
-        for report in [performance_report, schema_report]:
-            for table, issues in report.items():
-                for issue in issues:
-                    if issue.get('severity') == 'critical':
-                        critical_count += 1
-                    elif issue.get('severity') in ['medium', 'high']:
-                        medium_count += 1
-                    elif issue.get('severity') == 'low':
-                        low_count += 1
+        has_issues = bool(naming_analysis.get('issues') or index_report or performance_report or schema_report)
+        
+        # One clock read serves the report header and the patch filename
+        now = datetime.now()
+        
+        # Generate patches if requested
+        generate_patches = arguments.get("generate_patches", True)
+        workspace_dir = arguments.get("workspace_dir")
+        written = []
+        
+        if generate_patches and has_issues:
+            # Generate naming patches
+            if naming_analysis.get('issues'):
+                naming_fixes = await run_db_call(
+                    naming_analyzer.generate_naming_fix_sql, cursor, naming_analysis['issues'], db_name
+                )
+                naming_file = f"naming_fixes_{db_name}_{_run_timestamp(now)}.sql"
+                naming_path = await save_patch_file('\n'.join(naming_fixes), naming_file, workspace_dir)
+                written.append(("Naming fixes", naming_path))
+        
+        if wants_json(arguments):
+            return to_json({
+                "database": db_name,
+                "timestamp": now.isoformat(timespec="seconds"),
+                "summary": {"critical": critical_count, "medium_high": medium_count, "low": low_count},
+                "naming": naming_analysis,
+                "indexes": index_report,
+                "performance": performance_report,
+                "schema": schema_report,
+                "patch_files": dict(written),
+            })
         
         # Generate report
-        result = [
-            "🔍 **MySQL Comprehensive Analysis Report**",
-            "=" * 50,
-            f"**Database:** `{db_name}`",
-            "**Conventions:** Tables=CamelCase, Columns=snake_case",
-            f"**Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "## 📋 Executive Summary",
-            f"- 🔴 Critical Issues: {critical_count}",
-            f"- 🟡 Medium/High Issues: {medium_count}",
-            f"- 🟢 Low Priority Issues: {low_count}",
-            ""
-        ]
+        buf = io.StringIO()
+        buf.write(_COMPREHENSIVE_HEADER)
+        buf.write(f"**Database:** `{db_name}`\n")
+        buf.write("**Conventions:** Tables=CamelCase, Columns=snake_case\n")
+        buf.write(f"**Timestamp:** {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        buf.write("## 📋 Executive Summary\n")
+        buf.write(f"- 🔴 Critical Issues: {critical_count}\n")
+        buf.write(f"- 🟡 Medium/High Issues: {medium_count}\n")
+        buf.write(f"- 🟢 Low Priority Issues: {low_count}\n\n")
         
         # Add detailed analysis sections
         if naming_analysis.get('issues'):
-            result.extend([
-                "## 🏷️ Naming Conventions Analysis",
-                naming_analyzer.format_naming_report(naming_analysis),
-                ""
-            ])
+            buf.write("## 🏷️ Naming Conventions Analysis\n")
+            buf.write(naming_analyzer.format_naming_report(naming_analysis))
+            buf.write("\n\n")
         
         if index_report:
-            result.append("## 📊 Index Analysis")
-            for table, issues in index_report.items():
-                result.append(f"### Table: `{table}`")
-                
-                # Group issues by type for better readability
-                naming_issues = [i for i in issues if i['type'] == 'RENAME_INDEX']
-                redundancy_issues = [i for i in issues if i['type'] == 'DROP_INDEX']
-                performance_issues = [i for i in issues if i['type'] == 'LOW_CARDINALITY_INDEX']
-
-                if naming_issues:
-                    result.append("\n**🏷️ Index Naming Issues:**")
-                    for issue in naming_issues:
-                        result.append(f"- {issue['description']}")
-                
-                if redundancy_issues:
-                    result.append("\n**🔄 Redundant Indexes:**")
-                    for issue in redundancy_issues:
-                        result.append(f"- {issue['description']}")
-                
-                if performance_issues:
-                    result.append("\n**⚡ Performance Issues:**")
-                    for issue in performance_issues:
-                        result.append(f"- {issue['description']}")
-                
-                result.append("")
+            buf.write("## 📊 Index Analysis\n")
+            write_index_issues(buf, index_report)
         
-        # Generate patches if requested
-        generate_patches = arguments.get("generate_patches", True)
-        workspace_dir = arguments.get("workspace_dir")
+        if performance_report:
+            buf.write("## ⚡ Performance Analysis\n")
+            write_issues_by_severity(buf, performance_report)
         
-        if generate_patches and any([naming_analysis.get('issues'), index_report, performance_report, schema_report]):
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            
-            # Generate naming patches
-            if naming_analysis.get('issues'):
-                naming_fixes = naming_analyzer.generate_naming_fix_sql(cursor, naming_analysis['issues'], db_name)
-                naming_file = f"naming_fixes_{db_name}_{timestamp}.sql"
-                naming_path = save_patch_file('\n'.join(naming_fixes), naming_file, workspace_dir)
-                
-                result.extend([
-                    "## 🔧 SQL Patches Generated",
-                    f"✅ **Naming fixes:** `{naming_path}`",
-                    "",
-                    "⚠️ **Important:** Review and test all patches in a development environment before applying to production!",
-                    ""
-                ])
-        
-        if not any([naming_analysis.get('issues'), index_report, performance_report, schema_report]):
-            result.extend([
-                "## ✅ All Clear!",
-                "No issues found in any analysis category. Your database follows all naming conventions and best practices.",
-                ""
-            ])
-        
-        return "\n".join(result)
+        if schema_report:
+            buf.write("## 🏗️ Schema Analysis\n")
+            write_issues_by_severity(buf, schema_report)
         
-    finally:
-        if cursor:
-            cursor.close()
-        if connection and connection.is_connected():
-            connection.close()
+        if written:
+            buf.write("## 🔧 SQL Patches Generated\n")
+            for label, path in written:
+                buf.write(f"✅ **{label}:** `{path}`\n")
+            buf.write("\n⚠️ **Important:** Review and test all patches in a development environment before applying to production!\n\n")
+        
+        if not has_issues:
+            buf.write("## ✅ All Clear!\n")
+            buf.write("No issues found in any analysis category. Your database follows all naming conventions and best practices.\n\n")
+        
+        return buf.getvalue()
 
 async def tool_generate_sql_patches(arguments: Dict[str, Any]) -> str:
     """Generate SQL patches."""
     
-    connection, db_name = await get_database_connection(arguments)
-    cursor = None
-    
-    try:
-        cursor = connection.cursor()
+    async with db_cursor(arguments) as (cursor, db_name):
+        fingerprint, snapshot = await run_db_call(load_fingerprinted_snapshot, cursor, db_name)
         patch_type = arguments.get("patch_type", "comprehensive")
         workspace_dir = arguments.get("workspace_dir")
         
-        logger.info(f"Generating {patch_type} patches for database: {db_name}")
+        logger.debug(f"Generating {patch_type} patches for database: {db_name}")
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = _run_timestamp()
         
         if patch_type == "naming":
-            naming_analysis = naming_analyzer.run_naming_analysis(cursor, db_name)
+            naming_analysis = await run_db_call(
+                run_cached_analysis, "naming", naming_analyzer.run_naming_analysis, cursor, db_name, fingerprint,
+                snapshot=snapshot
+            )
             if not naming_analysis.get('issues'):
                 return "✅ No naming issues found - no patches needed!"
             
-            sql_fixes = naming_analyzer.generate_naming_fix_sql(cursor, naming_analysis['issues'], db_name)
+            sql_fixes = await run_db_call(
+                naming_analyzer.generate_naming_fix_sql, cursor, naming_analysis['issues'], db_name
+            )
             filename = f"naming_fixes_{db_name}_{timestamp}.sql"
-            filepath = save_patch_file('\n'.join(sql_fixes), filename, workspace_dir)
+            filepath = await save_patch_file('\n'.join(sql_fixes), filename, workspace_dir)
             
         elif patch_type == "comprehensive":
             # Run all analyses
-            naming_analysis = naming_analyzer.run_naming_analysis(cursor, db_name)
-            index_report = index_analyzer.run_index_analysis(cursor, db_name)
-            performance_report = performance_analyzer.analyze_performance(cursor, db_name)
-            schema_report = schema_analyzer.analyze_schema(cursor, db_name)
+            naming_analysis, index_report, performance_report, schema_report = await run_all_analyses(
+                arguments, cursor, db_name, fingerprint, snapshot
+            )
             
-            if not any([naming_analysis.get('issues'), index_report, performance_report, schema_report]):
+            if not (naming_analysis.get('issues') or index_report or performance_report or schema_report):
                 return "✅ No issues found - no patches needed!"
             
             # Generate comprehensive patches
             all_patches = []
             
             if naming_analysis.get('issues'):
-                naming_fixes = naming_analyzer.generate_naming_fix_sql(cursor, naming_analysis['issues'], db_name)
+                naming_fixes = await run_db_call(
+                    naming_analyzer.generate_naming_fix_sql, cursor, naming_analysis['issues'], db_name
+                )
                 all_patches.extend(naming_fixes)
             
             filename = f"comprehensive_fixes_{db_name}_{timestamp}.sql"
-            filepath = save_patch_file('\n'.join(all_patches), filename, workspace_dir)
+            filepath = await save_patch_file('\n'.join(all_patches), filename, workspace_dir)
         
         else:
             raise ValueError(f"Unknown patch type: {patch_type}")
@@ -601,11 +765,26 @@ async def tool_generate_sql_patches(arguments: Dict[str, Any]) -> str:
 
 The patch file contains detailed comments explaining each change."""
 
-    finally:
-        if cursor:
-            cursor.close()
-        if connection and connection.is_connected():
-            connection.close()
+# Tool name -> implementation, looked up once per call instead of walking an if/elif chain
+_TOOL_HANDLERS = {
+    "analyze_naming_conventions": tool_analyze_naming_conventions,
+    "analyze_database_indexes": tool_analyze_database_indexes,
+    "analyze_database_performance": tool_analyze_database_performance,
+    "analyze_database_schema": tool_analyze_database_schema,
+    "comprehensive_analysis": tool_comprehensive_analysis,
+    "generate_sql_patches": tool_generate_sql_patches,
+}
+
+async def warm_default_pool() -> None:
+    """
+    Open the default pool's connections in the background.
+    Tools fall back to connecting on demand, so failures are only logged.
+    """
+    try:
+        await run_db_call(db_connector.warm_pool)
+        logger.debug("Database connection pool warmed")
+    except Exception as e:
+        logger.warning(f"Could not pre-open database connections: {e}")
 
 # Main function following MCP patterns
 async def main():
@@ -616,6 +795,11 @@ async def main():
     
     # Use stdin/stdout streams for MCP communication
     async with stdio.stdio_server() as (read_stream, write_stream):
+        # Warm the pool alongside the initialize handshake rather than ahead of it
+        warm_up = None
+        if get_config().db_config.is_valid():
+            warm_up = asyncio.create_task(warm_default_pool())
+        
         await server.run(
             read_stream,
             write_stream,
@@ -628,6 +812,9 @@ async def main():
                 ),
             ),
         )
+        
+        if warm_up is not None:
+            warm_up.cancel()
 
 # Entry point
 if __name__ == "__main__":